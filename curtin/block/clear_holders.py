@@ -136,6 +136,7 @@ def shutdown_lvm(device):
     # remove the logical volume
     LOG.debug('using "lvremove" on %s', vg_lv_name)
     util.subp(['lvremove', '--force', '--force', vg_lv_name])
+    lvm.clear_lvm_info_cache()
 
     # if that was the last lvol in the volgroup, get rid of volgroup
     if len(lvm.get_lvols_in_volgroup(vg_name)) == 0:
@@ -7,11 +7,55 @@ This module provides some helper functions for manipulating lvm devices
 from curtin import distro
 from curtin import util
 from curtin.log import LOG
+from collections import defaultdict
+from concurrent import futures
 import os
+import re
 
 # separator to use for lvm/dm tools
 _SEP = '='
 
+# a 'match_field{_SEP}query_field' line in an undecoded report, leading and
+# trailing blanks are not part of the fields
+_SEP_BYTES = _SEP.encode()
+_LVM_REPORT_LINE_RE = re.compile(
+    rb'^[ \t]*([^\n%(sep)s]*)%(sep)s([^\n]*?)[ \t]*$' % {
+        b'sep': re.escape(_SEP_BYTES)},
+    re.MULTILINE)
+
+# parsed pv/vg/lvdisplay reports, keyed by the report command, so that
+# repeated lookups do not fork the lvm tools again. lvm_scan() and
+# activate_volgroups() drop the cache as lvm state may have changed.
+_LVM_REPORT_CACHE = {}
+
+
+def clear_lvm_info_cache():
+    """
+    drop cached lvm tool reports, required after lvm state changes
+    """
+    _LVM_REPORT_CACHE.clear()
+
+
+def _get_lvm_report(lvtool, match_field, query_field, args):
+    """
+    return dict of match_field value to list of query_field values, reusing
+    the cached report for the same command if one is present. the report is
+    not decoded, keys and values are bytes.
+    """
+    cmd = ([lvtool, '-C', '--separator', _SEP, '--noheadings',
+            '-o', ','.join([match_field, query_field])] + args)
+    key = tuple(cmd)
+    if key not in _LVM_REPORT_CACHE:
+        (out, _) = util.subp(cmd, capture=True, decode=False)
+        report = defaultdict(list)
+        # without a separator there are no report lines to parse, which is
+        # the usual case on systems with no lvm devices at all
+        if _SEP_BYTES in out:
+            for match in _LVM_REPORT_LINE_RE.finditer(out):
+                report[match.group(1)].append(match.group(2))
+        _LVM_REPORT_CACHE[key] = report
+    return _LVM_REPORT_CACHE[key]
+
 
 def _filter_lvm_info(lvtool, match_field, query_field, match_key, args=None):
     """
@@ -19,12 +63,10 @@ def _filter_lvm_info(lvtool, match_field, query_field, match_key, args=None):
     """
     if args is None:
         args = []
-    (out, _) = util.subp([lvtool, '-C', '--separator', _SEP, '--noheadings',
-                          '-o', ','.join([match_field, query_field])] + args,
-                         capture=True)
-    return [qf for (mf, qf) in
-            [line.strip().split(_SEP) for line in out.strip().splitlines()]
-            if mf == match_key]
+    report = _get_lvm_report(lvtool, match_field, query_field, args)
+    # only the matched values are decoded, not the whole tool output
+    return [qf.decode('utf-8', errors='replace')
+            for qf in report.get(match_key.encode(), [])]
 
 
 def get_pvols_in_volgroup(vg_name):
@@ -88,6 +130,7 @@ def activate_volgroups(multipath=False):
     # vgchange handles syncing with udev by default
     # see man 8 vgchange and flag --noudevsync
     out, _ = util.subp(cmd, capture=True)
+    clear_lvm_info_cache()
     if out:
         LOG.info(out)
 
@@ -132,11 +175,25 @@ def lvm_scan(activate=True, multipath=False):
         mponly = 'devices{ filter = [ "a|%s|", "a|%s|", "r|.*|" ] }' % (
             '/dev/mapper/mpath.*', '/dev/mapper/dm_crypt-.*')
 
-    for cmd in [['pvscan'], ['vgscan']]:
-        if release != 'precise' and lvmetad_running():
+    # distro.lsb_release() caches the host release for the whole run, so only
+    # the lvmetad check is left to do, and it need only be done once per scan
+    use_cache = release != 'precise' and lvmetad_running()
+
+    cmds = [['pvscan'], ['vgscan']]
+    for cmd in cmds:
+        if use_cache:
             cmd.append('--cache')
         if multipath:
             cmd.extend(['--config', mponly])
-        util.subp(cmd, capture=True)
+
+    # the scans are independent of each other, run them concurrently so the
+    # total time is that of the slowest scan rather than the sum of them all
+    with futures.ThreadPoolExecutor(max_workers=len(cmds)) as executor:
+        scans = [executor.submit(util.subp, cmd, capture=True) for cmd in cmds]
+        for scan in futures.as_completed(scans):
+            # re-raise any ProcessExecutionError from the scan
+            scan.result()
+
+    clear_lvm_info_cache()
 
 # vi: ts=4 expandtab syntax=python
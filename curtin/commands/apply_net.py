@@ -13,56 +13,45 @@ from . import populate_one_subcmd
 
 LOG = log.LOG
 
-IFUPDOWN_IPV6_MTU_PRE_HOOK = """#!/bin/bash -e
-# injected by curtin installer
-
-[ "${IFACE}" != "lo" ] || exit 0
-
-# Trigger only if MTU configured
-[ -n "${IF_MTU}" ] || exit 0
-
-read CUR_DEV_MTU </sys/class/net/${IFACE}/mtu ||:
-read CUR_IPV6_MTU </proc/sys/net/ipv6/conf/${IFACE}/mtu ||:
-[ -n "${CUR_DEV_MTU}" ] && echo ${CUR_DEV_MTU} > /run/network/${IFACE}_dev.mtu
-[ -n "${CUR_IPV6_MTU}" ] &&
-  echo ${CUR_IPV6_MTU} > /run/network/${IFACE}_ipv6.mtu
-exit 0
-"""
-
-IFUPDOWN_IPV6_MTU_POST_HOOK = """#!/bin/bash -e
-# injected by curtin installer
-
-[ "${IFACE}" != "lo" ] || exit 0
-
-# Trigger only if MTU configured
-[ -n "${IF_MTU}" ] || exit 0
-
-read PRE_DEV_MTU </run/network/${IFACE}_dev.mtu ||:
-read CUR_DEV_MTU </sys/class/net/${IFACE}/mtu ||:
-read PRE_IPV6_MTU </run/network/${IFACE}_ipv6.mtu ||:
-read CUR_IPV6_MTU </proc/sys/net/ipv6/conf/${IFACE}/mtu ||:
-
-if [ "${ADDRFAM}" = "inet6" ]; then
-  # We need to check the underlying interface MTU and
-  # raise it if the IPV6 mtu is larger
-  if [ ${CUR_DEV_MTU} -lt ${IF_MTU} ]; then
-      ip link set ${IFACE} mtu ${IF_MTU}
-  fi
-  # sysctl -q -e -w net.ipv6.conf.${IFACE}.mtu=${IF_MTU}
-  echo ${IF_MTU} >/proc/sys/net/ipv6/conf/${IFACE}/mtu ||:
-
-elif [ "${ADDRFAM}" = "inet" ]; then
-  # handle the clobber case where inet mtu changes v6 mtu.
-  # ifupdown will already have set dev mtu, so lower mtu
-  # if needed.  If v6 mtu was larger, it get's clamped down
-  # to the dev MTU value.
-  if [ ${PRE_IPV6_MTU} -lt ${CUR_IPV6_MTU} ]; then
-    # sysctl -q -e -w net.ipv6.conf.${IFACE}.mtu=${PRE_IPV6_MTU}
-    echo ${PRE_IPV6_MTU} >/proc/sys/net/ipv6/conf/${IFACE}/mtu ||:
-  fi
-fi
-exit 0
-"""
+# non-comment lines of the Ubuntu server image ipv6 privacy config, and what
+# curtin replaces it with
+_IPV6_PRIVACY_KNOWN_CONTENTS = (
+    "net.ipv6.conf.all.use_tempaddr = 2",
+    "net.ipv6.conf.default.use_tempaddr = 2",
+)
+_IPV6_PRIVACY_CURTIN_CONTENTS = '\n'.join(
+    ["# IPv6 Privacy Extensions (RFC 4941)",
+     "# Disabled by curtin",
+     "# net.ipv6.conf.all.use_tempaddr = 2",
+     "# net.ipv6.conf.default.use_tempaddr = 2"])
+
+# non-comment lines of the legacy cloud image eth0.cfg
+_LEGACY_ETH0_KNOWN_CONTENTS = ("auto eth0", "iface eth0 inet dhcp")
+
+# the ifupdown ipv6 mtu hook scripts live in curtin.net.ifupdown_hooks and
+# are only loaded, and encoded, the first time they are written
+_IFUPDOWN_IPV6_MTU_HOOK_NAMES = {
+    'prehook': 'IFUPDOWN_IPV6_MTU_PRE_HOOK',
+    'posthook': 'IFUPDOWN_IPV6_MTU_POST_HOOK',
+}
+_IFUPDOWN_IPV6_MTU_HOOKS = {}
+
+
+def __getattr__(name):
+    # the hook scripts used to be defined here, keep them importable
+    if name in _IFUPDOWN_IPV6_MTU_HOOK_NAMES.values():
+        from curtin.net import ifupdown_hooks
+        return getattr(ifupdown_hooks, name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def _get_ifupdown_ipv6_mtu_hooks():
+    if not _IFUPDOWN_IPV6_MTU_HOOKS:
+        from curtin.net import ifupdown_hooks
+        for (hook, name) in _IFUPDOWN_IPV6_MTU_HOOK_NAMES.items():
+            _IFUPDOWN_IPV6_MTU_HOOKS[hook] = (
+                getattr(ifupdown_hooks, name).encode('utf-8'))
+    return _IFUPDOWN_IPV6_MTU_HOOKS
 
 
 def apply_net(target, network_state=None, network_config=None):
@@ -115,21 +104,25 @@ def _patch_ifupdown_ipv6_mtu_hook(target,
                                   prehookfn="etc/network/if-pre-up.d/mtuipv6",
                                   posthookfn="etc/network/if-up.d/mtuipv6"):
 
-    contents = {
-        'prehook': IFUPDOWN_IPV6_MTU_PRE_HOOK,
-        'posthook': IFUPDOWN_IPV6_MTU_POST_HOOK,
-    }
-
     hookfn = {
         'prehook': prehookfn,
         'posthook': posthookfn,
     }
 
+    contents = _get_ifupdown_ipv6_mtu_hooks()
     for hook in ['prehook', 'posthook']:
         fn = hookfn[hook]
         cfg = paths.target_path(target, path=fn)
         LOG.info('Injecting fix for ipv6 mtu settings: %s', cfg)
-        util.write_file(cfg, contents[hook], mode=0o755)
+        util.write_file(cfg, contents[hook], mode=0o755, omode='wb')
+
+
+def _has_known_contents(contents, known_contents):
+    """Return True if the non-comment lines of contents, stripped, are
+       exactly known_contents.  Stops at the first line that differs."""
+    lines = (f.strip() for f in contents.splitlines() if not f.startswith("#"))
+    return (all(next(lines, None) == known for known in known_contents) and
+            next(lines, None) is None)
 
 
 def _disable_ipv6_privacy_extensions(target,
@@ -141,33 +134,24 @@ def _disable_ipv6_privacy_extensions(target,
 
     LOG.debug('Attempting to remove ipv6 privacy extensions')
     cfg = paths.target_path(target, path=path)
-    if not os.path.exists(cfg):
-        LOG.warn('Failed to find ipv6 privacy conf file %s', cfg)
-        return
-
     bmsg = "Disabling IPv6 privacy extensions config may not apply."
     try:
         contents = util.load_file(cfg)
-        known_contents = ["net.ipv6.conf.all.use_tempaddr = 2",
-                          "net.ipv6.conf.default.use_tempaddr = 2"]
-        lines = [f.strip() for f in contents.splitlines()
-                 if not f.startswith("#")]
-        if lines == known_contents:
+        if _has_known_contents(contents, _IPV6_PRIVACY_KNOWN_CONTENTS):
             LOG.info('Removing ipv6 privacy extension config file: %s', cfg)
             util.del_file(cfg)
             msg = "removed %s with known contents" % cfg
-            curtin_contents = '\n'.join(
-                ["# IPv6 Privacy Extensions (RFC 4941)",
-                 "# Disabled by curtin",
-                 "# net.ipv6.conf.all.use_tempaddr = 2",
-                 "# net.ipv6.conf.default.use_tempaddr = 2"])
-            util.write_file(cfg, curtin_contents)
+            util.write_file(cfg, _IPV6_PRIVACY_CURTIN_CONTENTS)
         else:
             LOG.debug('skipping removal of %s, expected content not found',
                       cfg)
-            LOG.debug("Found content in file %s:\n%s", cfg, lines)
-            LOG.debug("Expected contents in file %s:\n%s", cfg, known_contents)
+            LOG.debug("Found content in file %s:\n%s", cfg, contents)
+            LOG.debug("Expected contents in file %s:\n%s", cfg,
+                      _IPV6_PRIVACY_KNOWN_CONTENTS)
             msg = (bmsg + " '%s' exists with user configured content." % cfg)
+    except FileNotFoundError:
+        LOG.warn('Failed to find ipv6 privacy conf file %s', cfg)
+        return
     except Exception as e:
         msg = bmsg + " %s exists, but could not be read. %s" % (cfg, e)
         LOG.exception(msg)
@@ -187,21 +171,17 @@ def _maybe_remove_legacy_eth0(target,
     """
 
     cfg = paths.target_path(target, path=path)
-    if not os.path.exists(cfg):
-        LOG.warn('Failed to find legacy network conf file %s', cfg)
-        return
-
     bmsg = "Dynamic networking config may not apply."
     try:
         contents = util.load_file(cfg)
-        known_contents = ["auto eth0", "iface eth0 inet dhcp"]
-        lines = [f.strip() for f in contents.splitlines()
-                 if not f.startswith("#")]
-        if lines == known_contents:
+        if _has_known_contents(contents, _LEGACY_ETH0_KNOWN_CONTENTS):
             util.del_file(cfg)
             msg = "removed %s with known contents" % cfg
         else:
             msg = (bmsg + " '%s' exists with user configured content." % cfg)
+    except FileNotFoundError:
+        LOG.warn('Failed to find legacy network conf file %s', cfg)
+        return
     except Exception:
         msg = bmsg + " %s exists, but could not be read." % cfg
         LOG.exception(msg)
@@ -545,7 +545,7 @@ def render_netconfig_passthrough(target, netconfig=None):
         raise ValueError("Network config must contain the key 'network'")
 
     content = config.dump_config(netconfig)
-    cc_passthrough = os.path.sep.join((target, cc,))
+    cc_passthrough = os.path.join(target, cc)
     LOG.info('Writing network config to %s: %s', cc, cc_passthrough)
     util.write_file(cc_passthrough, content=content)
 
@@ -556,15 +556,15 @@ def render_network_state(target, network_state):
     netrules = 'etc/udev/rules.d/70-persistent-net.rules'
     cc = 'etc/cloud/cloud.cfg.d/curtin-disable-cloudinit-networking.cfg'
 
-    eni = os.path.sep.join((target, eni,))
+    eni = os.path.join(target, eni)
     LOG.info('Writing ' + eni)
     util.write_file(eni, content=render_interfaces(network_state))
 
-    netrules = os.path.sep.join((target, netrules,))
+    netrules = os.path.join(target, netrules)
     LOG.info('Writing ' + netrules)
     util.write_file(netrules, content=render_persistent_net(network_state))
 
-    cc_disable = os.path.sep.join((target, cc,))
+    cc_disable = os.path.join(target, cc)
     LOG.info('Writing ' + cc_disable)
     util.write_file(cc_disable, content='network: {config: disabled}\n')
 
@@ -207,7 +207,8 @@ def _geturl(url, headers=None, headers_cb=None, exception_cb=None, data=None):
 
     try:
         req = urllib_request.Request(url=url, data=data, headers=headers)
-        r = urllib_request.urlopen(req).read()
+        with urllib_request.urlopen(req) as resp:
+            r = resp.read()
         # python2, we want to return bytes, which is what python3 does
         if isinstance(r, str):
             return r.decode()
@@ -7,6 +7,14 @@ import subprocess
 _PACKAGED_VERSION = '@@PACKAGED_VERSION@@'
 _PACKED_VERSION = '@@PACKED_VERSION@@'
 
+# location of the git checkout curtin may be running from, this does not
+# change for the life of the process
+_GITDIR = os.path.abspath(os.path.join(__file__, '..', '..', '.git'))
+
+# version found from the git checkout, set on first use so that
+# 'git describe' is only run once per process
+_GIT_VERSION = None
+
 
 def version_string():
     """ Extract a version string from curtin source or version file"""
@@ -17,18 +25,22 @@ def version_string():
     if not _PACKED_VERSION.startswith('@@'):
         return _PACKED_VERSION
 
+    global _GIT_VERSION
+    if _GIT_VERSION is not None:
+        return _GIT_VERSION
+
     version = old_version
-    gitdir = os.path.abspath(os.path.join(__file__, '..', '..', '.git'))
-    if os.path.exists(gitdir):
+    if os.path.exists(_GITDIR):
         try:
             out = subprocess.check_output(
                 ['git', 'describe', '--long', '--abbrev=8',
                  "--match=[0-9][0-9]*"],
-                cwd=os.path.dirname(gitdir))
+                cwd=os.path.dirname(_GITDIR))
             version = out.decode('utf-8').strip()
         except subprocess.CalledProcessError:
             pass
 
+    _GIT_VERSION = version
     return version
 
 # vi: ts=4 expandtab syntax=python
@@ -1,6 +1,7 @@
 # This file is part of curtin. See LICENSE file for copyright and license info.
 
 from curtin.block import lvm
+from curtin import util
 
 from .helpers import CiTestCase
 from unittest import mock
@@ -9,6 +10,11 @@ from unittest import mock
 class TestBlockLvm(CiTestCase):
     vg_name = 'ubuntu-volgroup'
 
+    def setUp(self):
+        super(TestBlockLvm, self).setUp()
+        lvm.clear_lvm_info_cache()
+        self.addCleanup(lvm.clear_lvm_info_cache)
+
     @mock.patch('curtin.block.lvm.util')
     def test_filter_lvm_info(self, mock_util):
         """make sure lvm._filter_lvm_info filters properly"""
@@ -28,19 +34,72 @@ class TestBlockLvm(CiTestCase):
             """.format(matchfield_good=self.vg_name,
                        query_good1=query_results[0],
                        query_good2=query_results[1],
-                       sep=lvm._SEP), "")
+                       sep=lvm._SEP).encode(), b"")
         result_list = lvm._filter_lvm_info(lvtool_name, match_name,
                                            query_name, self.vg_name)
         self.assertEqual(len(result_list), 2)
         mock_util.subp.assert_called_with(
             [lvtool_name, '-C', '--separator', lvm._SEP, '--noheadings', '-o',
-             '{},{}'.format(match_name, query_name)], capture=True)
+             '{},{}'.format(match_name, query_name)], capture=True,
+            decode=False)
         self.assertEqual(result_list, query_results)
         # make sure _filter_lvm_info can fail gracefully if no match
         result_list = lvm._filter_lvm_info(lvtool_name, match_name,
                                            query_name, 'bad_match_val')
         self.assertEqual(len(result_list), 0)
 
+    @mock.patch('curtin.block.lvm.util')
+    def test_filter_lvm_info_strips_blanks(self, mock_util):
+        """_filter_lvm_info ignores blanks around a report line"""
+        mock_util.subp.return_value = (
+            '\n  lv1{sep}1073741824B  \n\t\n'.format(sep=lvm._SEP).encode(),
+            b'')
+        self.assertEqual(['1073741824B'], lvm._filter_lvm_info(
+            'lvdisplay', 'lv_name', 'lv_size', 'lv1', args=['--units=B']))
+
+    @mock.patch('curtin.block.lvm._LVM_REPORT_LINE_RE')
+    @mock.patch('curtin.block.lvm.util')
+    def test_filter_lvm_info_empty_report(self, mock_util, mock_line_re):
+        """_filter_lvm_info does not parse a report with no lines"""
+        mock_util.subp.return_value = (b'\n', b'')
+        self.assertEqual([], lvm.get_pvols_in_volgroup(self.vg_name))
+        self.assertEqual(0, mock_line_re.finditer.call_count)
+
+    @mock.patch('curtin.block.lvm.util')
+    def test_filter_lvm_info_reuses_report(self, mock_util):
+        """_filter_lvm_info runs the lvm tool once for repeated lookups"""
+        mock_util.subp.return_value = (
+            '  vg1{sep}lv1\n  vg2{sep}lv2\n  vg1{sep}lv3\n'.format(
+                sep=lvm._SEP).encode(), b'')
+        self.assertEqual(['lv1', 'lv3'], lvm.get_lvols_in_volgroup('vg1'))
+        self.assertEqual(['lv2'], lvm.get_lvols_in_volgroup('vg2'))
+        self.assertEqual([], lvm.get_lvols_in_volgroup('vg3'))
+        self.assertEqual(1, mock_util.subp.call_count)
+
+        # a different query is a different report
+        lvm.get_pvols_in_volgroup('vg1')
+        self.assertEqual(2, mock_util.subp.call_count)
+
+        # dropping the cache makes the next lookup run the tool again
+        lvm.clear_lvm_info_cache()
+        lvm.get_lvols_in_volgroup('vg1')
+        self.assertEqual(3, mock_util.subp.call_count)
+
+    @mock.patch('curtin.block.lvm.lvmetad_running')
+    @mock.patch('curtin.block.lvm.util')
+    @mock.patch('curtin.block.lvm.distro')
+    def test_lvm_scan_clears_lvm_info_cache(self, mock_distro, mock_util,
+                                            mock_lvmetad):
+        """lvm_scan drops cached lvm reports"""
+        mock_distro.lsb_release.return_value = {'codename': 'focal'}
+        mock_lvmetad.return_value = False
+        mock_util.subp.return_value = (
+            'vg1{sep}lv1'.format(sep=lvm._SEP).encode(), b'')
+        lvm.get_lvols_in_volgroup('vg1')
+        self.assertNotEqual({}, lvm._LVM_REPORT_CACHE)
+        lvm.lvm_scan()
+        self.assertEqual({}, lvm._LVM_REPORT_CACHE)
+
     @mock.patch('curtin.block.lvm._filter_lvm_info')
     def test_get_lvm_info(self, mock_filter_lvm_info):
         """
@@ -92,7 +151,7 @@ class TestBlockLvm(CiTestCase):
 
             calls = [mock.call(cmd, capture=True) for cmd in expected]
             self.assertEqual(len(expected), len(mock_util.subp.call_args_list))
-            mock_util.subp.assert_has_calls(calls)
+            mock_util.subp.assert_has_calls(calls, any_order=True)
             mock_util.subp.reset_mock()
 
     @mock.patch('curtin.block.lvm.lvmetad_running')
@@ -112,7 +171,36 @@ class TestBlockLvm(CiTestCase):
         expected = [cmd + cmd_filter for cmd in cmds]
         calls = [mock.call(cmd, capture=True) for cmd in expected]
         self.assertEqual(len(expected), len(mock_util.subp.call_args_list))
-        mock_util.subp.assert_has_calls(calls)
+        mock_util.subp.assert_has_calls(calls, any_order=True)
+
+    @mock.patch('curtin.block.lvm.lvmetad_running')
+    @mock.patch('curtin.block.lvm.util')
+    @mock.patch('curtin.block.lvm.distro')
+    def test_lvm_scan_checks_lvmetad_once(self, mock_distro, mock_util,
+                                          mock_lvmetad):
+        """check that lvm_scan only checks for lvmetad once per scan."""
+        mock_distro.lsb_release.return_value = {'codename': 'xenial'}
+        mock_lvmetad.return_value = True
+        lvm.lvm_scan()
+        self.assertEqual(1, mock_lvmetad.call_count)
+        self.assertEqual(1, mock_distro.lsb_release.call_count)
+        mock_util.subp.assert_has_calls(
+            [mock.call(['pvscan', '--cache'], capture=True),
+             mock.call(['vgscan', '--cache'], capture=True)], any_order=True)
+
+    @mock.patch('curtin.block.lvm.lvmetad_running')
+    @mock.patch('curtin.block.lvm.util')
+    @mock.patch('curtin.block.lvm.distro')
+    def test_lvm_scan_raises_on_scan_failure(self, mock_distro, mock_util,
+                                             mock_lvmetad):
+        """check that lvm_scan re-raises errors from a failed scan."""
+        mock_distro.lsb_release.return_value = {'codename': 'focal'}
+        mock_lvmetad.return_value = False
+        mock_util.subp.side_effect = [
+            ('', ''), util.ProcessExecutionError(cmd=['vgscan'])]
+        with self.assertRaises(util.ProcessExecutionError):
+            lvm.lvm_scan()
+        self.assertEqual(2, len(mock_util.subp.call_args_list))
 
 
 class TestBlockLvmMultipathFilter(CiTestCase):
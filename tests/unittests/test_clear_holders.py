@@ -197,6 +197,7 @@ class TestClearHolders(CiTestCase):
         self.assertTrue(mock_log.debug.called)
         mock_util.subp.assert_called_with(
             ['lvremove', '--force', '--force', vg_lv_name])
+        self.assertTrue(mock_lvm.clear_lvm_info_cache.called)
         mock_lvm.get_lvols_in_volgroup.assert_called_with(vg_name)
         self.assertEqual(len(mock_util.subp.call_args_list), 1)
         mock_lvm.get_lvols_in_volgroup.return_value = []
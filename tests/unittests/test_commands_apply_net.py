@@ -155,12 +155,12 @@ class TestApplyNetPatchIfupdown(CiTestCase):
 
         precfg = paths.target_path(target, path=prehookfn)
         postcfg = paths.target_path(target, path=posthookfn)
-        precontents = apply_net.IFUPDOWN_IPV6_MTU_PRE_HOOK
-        postcontents = apply_net.IFUPDOWN_IPV6_MTU_POST_HOOK
+        precontents = apply_net.IFUPDOWN_IPV6_MTU_PRE_HOOK.encode('utf-8')
+        postcontents = apply_net.IFUPDOWN_IPV6_MTU_POST_HOOK.encode('utf-8')
 
         hook_calls = [
-            call(precfg, precontents, mode=mode),
-            call(postcfg, postcontents, mode=mode),
+            call(precfg, precontents, mode=mode, omode='wb'),
+            call(postcfg, postcontents, mode=mode, omode='wb'),
         ]
         mock_write.assert_has_calls(hook_calls)
 
@@ -208,6 +208,27 @@ class TestApplyNetPatchIfupdown(CiTestCase):
         self.assertEqual(0, mock_write.call_count)
 
 
+class TestApplyNetHasKnownContents(CiTestCase):
+
+    known = ['auto eth0', 'iface eth0 inet dhcp']
+
+    def test_known_contents_match(self):
+        contents = '# comment\n  auto eth0\niface eth0 inet dhcp  \n'
+        self.assertTrue(apply_net._has_known_contents(contents, self.known))
+
+    def test_known_contents_extra_lines(self):
+        contents = 'auto eth0\niface eth0 inet dhcp\n\nmtu 1500\n'
+        self.assertFalse(apply_net._has_known_contents(contents, self.known))
+
+    def test_known_contents_missing_lines(self):
+        self.assertFalse(apply_net._has_known_contents('auto eth0',
+                                                       self.known))
+
+    def test_known_contents_mismatch(self):
+        contents = 'auto eth1\niface eth0 inet dhcp\n'
+        self.assertFalse(apply_net._has_known_contents(contents, self.known))
+
+
 class TestApplyNetPatchIpv6Priv(CiTestCase):
 
     @patch('curtin.util.del_file')
@@ -248,20 +269,22 @@ class TestApplyNetPatchIpv6Priv(CiTestCase):
                           apply_net._disable_ipv6_privacy_extensions,
                           target)
 
+    @patch('os.path.exists')
+    @patch('curtin.util.write_file')
     @patch('curtin.util.load_file')
-    @patch('os.path')
-    def test_disable_ipv6_priv_extentions_notfound(self, mock_ospath,
-                                                   mock_load):
+    def test_disable_ipv6_priv_extentions_notfound(self, mock_load,
+                                                   mock_write, mock_exists):
         target = 'mytarget'
         path = 'foo.conf'
-        mock_ospath.exists.return_value = False
+        mock_load.side_effect = FileNotFoundError
 
         apply_net._disable_ipv6_privacy_extensions(target, path=path)
 
-        # source file not found
+        # source file not found, found out by the load alone
         cfg = paths.target_path(target, path)
-        mock_ospath.exists.assert_called_with(cfg)
-        self.assertEqual(0, mock_load.call_count)
+        mock_load.assert_called_once_with(cfg)
+        self.assertEqual(0, mock_exists.call_count)
+        self.assertEqual(0, mock_write.call_count)
 
 
 class TestApplyNetRemoveLegacyEth0(CiTestCase):
@@ -318,21 +341,21 @@ class TestApplyNetRemoveLegacyEth0(CiTestCase):
 
         self.assertEqual(0, mock_del.call_count)
 
+    @patch('os.path.exists')
     @patch('curtin.util.del_file')
     @patch('curtin.util.load_file')
-    @patch('os.path')
-    def test_remove_legacy_eth0_notfound(self, mock_ospath, mock_load,
-                                         mock_del):
+    def test_remove_legacy_eth0_notfound(self, mock_load, mock_del,
+                                         mock_exists):
         target = 'mytarget'
         path = 'eth0.conf'
-        mock_ospath.exists.return_value = False
+        mock_load.side_effect = FileNotFoundError
 
         apply_net._maybe_remove_legacy_eth0(target, path)
 
-        # source file not found
+        # source file not found, found out by the load alone
         cfg = paths.target_path(target, path)
-        mock_ospath.exists.assert_called_with(cfg)
-        self.assertEqual(0, mock_load.call_count)
+        mock_load.assert_called_once_with(cfg)
+        self.assertEqual(0, mock_exists.call_count)
         self.assertEqual(0, mock_del.call_count)
 
 # vi: ts=4 expandtab syntax=python
@@ -78,6 +78,18 @@ class TestDownload(CiTestCase):
                         "Downloaded file differed from source file.")
 
 
+class TestGetUrl(CiTestCase):
+
+    @mock.patch('curtin.url_helper.urllib_request.urlopen')
+    def test_geturl_closes_response(self, mock_urlopen):
+        """_geturl closes the response once it has been read."""
+        resp = mock_urlopen.return_value.__enter__.return_value
+        resp.read.return_value = b'content'
+
+        self.assertEqual(b'content', url_helper._geturl('http://host/'))
+        self.assertEqual(1, mock_urlopen.return_value.__exit__.call_count)
+
+
 class TestGetMaasVersion(CiTestCase):
     @mock.patch('curtin.url_helper.geturl')
     def test_get_maas_version(self, mock_get_url):
@@ -15,6 +15,7 @@ class TestCurtinVersion(CiTestCase):
         super(TestCurtinVersion, self).setUp()
         self.add_patch('subprocess.check_output', 'mock_subp')
         self.add_patch('os.path', 'mock_path')
+        self.add_patch('curtin.version._GIT_VERSION', new=None)
 
     @mock.patch.object(os, 'getcwd')
     def test_packaged_version(self, mock_getcwd):
@@ -41,6 +42,29 @@ class TestCurtinVersion(CiTestCase):
         ver_string = version.version_string()
         self.assertEqual(git_describe, ver_string)
 
+    def test_git_describe_version_cached(self):
+        self.mock_path.exists.return_value = True
+        git_describe = old_version + "-13-g90fa654f"
+        self.mock_subp.return_value = git_describe.encode("utf-8")
+
+        self.assertEqual(git_describe, version.version_string())
+        self.assertEqual(git_describe, version.version_string())
+        self.assertEqual(1, self.mock_subp.call_count)
+
+    @mock.patch.object(os, 'chdir')
+    def test_git_describe_uses_cwd(self, mock_chdir):
+        """git describe runs in the checkout without changing directory"""
+        self.mock_path.exists.return_value = True
+        self.mock_path.dirname.return_value = '/src/curtin'
+        self.mock_subp.return_value = b'1.0-13-g90fa654f'
+
+        version.version_string()
+
+        self.mock_subp.assert_called_once_with(
+            ['git', 'describe', '--long', '--abbrev=8',
+             "--match=[0-9][0-9]*"], cwd='/src/curtin')
+        self.assertEqual(0, mock_chdir.call_count)
+
     @mock.patch.object(os, 'getcwd')
     def test_git_describe_version_exception(self, mock_getcwd):
         self.mock_path.exists.return_value = True